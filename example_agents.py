@@ -3,10 +3,18 @@ Example AI agent implementations for WikiBench evaluation.
 These demonstrate how to implement the AIAgent interface.
 """
 
-from wikibench import AIAgent, EvaluationMode, WikipediaNavigator
-from typing import List
+from wikibench import AIAgent, EvaluationMode, WikipediaNavigator, get_target_page
+from typing import Dict, List, Optional, Sequence, Tuple
 import random
-import os
+import re
+import threading
+
+
+# Shared path for agents that give up (the evaluator copies returned paths)
+_EMPTY_PATH = ()
+
+# Bonus terms for American/English content (often relevant to entertainment topics)
+_GEO_RE = re.compile(r"american|english|british|united states")
 
 
 class RandomAgent(AIAgent):
@@ -15,7 +23,7 @@ class RandomAgent(AIAgent):
     def __init__(self, max_steps: int = 10):
         self.max_steps = max_steps
         self.navigator = WikipediaNavigator()
-        self.target_page = os.getenv("WIKIBENCH_TARGET_PAGE", "Kevin Bacon")
+        self.target_page = get_target_page()
     
     def solve_wikibench(self, start_page: str, start_url: str, mode: EvaluationMode) -> List[str]:
         if mode == EvaluationMode.NO_TOOL_USE:
@@ -30,21 +38,23 @@ class RandomAgent(AIAgent):
         else:  # TOOL_USE mode
             current_url = start_url
             path = []
+            target = self.target_page
+            get_page_link_lists = self.navigator.get_page_link_lists
             
             for _ in range(self.max_steps):
                 try:
-                    links = self.navigator.get_page_links(current_url)
-                    if not links:
+                    titles, urls = get_page_link_lists(current_url)
+                    if not titles:
                         break
                     
                     # Check if target page is in the links
-                    for title, url in links:
-                        if self.target_page in title:
-                            path.append(self.target_page)
-                            return path
+                    if any(target in title for title in titles):
+                        path.append(target)
+                        return path
                     
                     # Otherwise pick a random link
-                    title, url = random.choice(links)
+                    i = random.randrange(len(titles))
+                    title, url = titles[i], urls[i]
                     path.append(title)
                     current_url = url
                     
@@ -63,7 +73,7 @@ class GreedyActorAgent(AIAgent):
     def __init__(self, max_steps: int = 15):
         self.max_steps = max_steps
         self.navigator = WikipediaNavigator()
-        self.target_page = os.getenv("WIKIBENCH_TARGET_PAGE", "Kevin Bacon")
+        self.target_page = get_target_page()
         self.actor_keywords = [
             "actor", "actress", "film", "movie", "cinema", "hollywood", 
             "director", "producer", "celebrity", "star", "entertainment",
@@ -83,44 +93,43 @@ class GreedyActorAgent(AIAgent):
         else:  # TOOL_USE mode
             current_url = start_url
             path = []
+            target = self.target_page
+            get_page_link_lists = self.navigator.get_page_link_lists
+            keywords = tuple(self.actor_keywords)
             
             for step in range(self.max_steps):
                 try:
-                    links = self.navigator.get_page_links(current_url)
-                    if not links:
+                    titles, urls = get_page_link_lists(current_url)
+                    if not titles:
                         break
                     
                     # Check if target page is directly available
-                    for title, url in links:
-                        if self.target_page in title:
-                            path.append(self.target_page)
-                            return path
+                    if any(target in title for title in titles):
+                        path.append(target)
+                        return path
+                    
+                    titles_lower = [title.lower() for title in titles]
                     
                     # Score links based on actor/entertainment relevance
-                    scored_links = []
-                    for title, url in links:
-                        score = 0
-                        title_lower = title.lower()
+                    scores = []
+                    for title_lower in titles_lower:
+                        # One point per keyword found in the title
+                        score = sum(map(title_lower.__contains__, keywords))
                         
-                        for keyword in self.actor_keywords:
-                            if keyword in title_lower:
-                                score += 1
-                        
-                        # Bonus for American/English content (often relevant to entertainment topics)
-                        if any(word in title_lower for word in ["american", "english", "british", "united states"]):
+                        # Bonus for American/English content
+                        if _GEO_RE.search(title_lower):
                             score += 2
                         
-                        scored_links.append((score, title, url))
+                        scores.append(score)
                     
-                    # Sort by score and pick the best
-                    scored_links.sort(reverse=True)
+                    # Single pass for the best (score, title, url); ties resolve as a
+                    # descending sort would
+                    best_score, title, url = max(zip(scores, titles, urls))
                     
-                    if scored_links and scored_links[0][0] > 0:
-                        _, title, url = scored_links[0]
-                    else:
+                    if best_score <= 0:
                         # If no good matches, pick randomly from top 10
-                        top_links = links[:10] if len(links) >= 10 else links
-                        title, url = random.choice(top_links)
+                        i = random.randrange(min(len(titles), 10))
+                        title, url = titles[i], urls[i]
                     
                     path.append(title)
                     current_url = url
@@ -137,14 +146,24 @@ class GreedyActorAgent(AIAgent):
 class HeuristicAgent(AIAgent):
     """An agent that uses multiple heuristics to navigate toward the target page"""
     
+    SCORE_CACHE_SIZE = 256  # Pages whose link scores are kept for reuse
+    
     def __init__(self, max_steps: int = 20):
         self.max_steps = max_steps
         self.navigator = WikipediaNavigator()
         self.visited_pages = set()
-        self.target_page = os.getenv("WIKIBENCH_TARGET_PAGE", "Kevin Bacon")
+        self.target_page = get_target_page()
+        self._target_lower = self.target_page.lower()
+        self._target_tail_lower = self.target_page.split()[-1].lower()
+        self._build_term_masks()
+        # Shared by concurrent walks, so guarded by a lock
+        self._score_cache: Dict[Tuple[Tuple[str, ...], bool], List[int]] = {}
+        self._score_cache_lock = threading.Lock()
     
     def solve_wikibench(self, start_page: str, start_url: str, mode: EvaluationMode) -> List[str]:
-        self.visited_pages = {start_page}  # Reset for each evaluation
+        # Reset for each evaluation; the walk only touches its own local set so
+        # one agent can run several walks concurrently
+        visited = {start_page}
         
         if mode == EvaluationMode.NO_TOOL_USE:
             # Strategic conceptual path
@@ -159,36 +178,40 @@ class HeuristicAgent(AIAgent):
         else:  # TOOL_USE mode
             current_url = start_url
             path = []
+            target = self.target_page
+            get_page_link_lists = self.navigator.get_page_link_lists
             
             for step in range(self.max_steps):
                 try:
-                    links = self.navigator.get_page_links(current_url)
-                    if not links:
+                    titles, urls = get_page_link_lists(current_url)
+                    if not titles:
                         break
                     
                     # Check if target page is directly available
-                    for title, url in links:
-                        if self.target_page in title:
-                            path.append(self.target_page)
-                            return path
+                    if any(target in title for title in titles):
+                        path.append(target)
+                        return path
+                    
+                    titles_lower = [title.lower() for title in titles]
                     
                     # Apply heuristics to score links
-                    best_link = self._select_best_link(links, step)
+                    best_link = self._select_best_link(titles, urls, titles_lower, step)
                     
                     if best_link:
                         title, url = best_link
-                        if title not in self.visited_pages:
+                        if title not in visited:
                             path.append(title)
                             current_url = url
-                            self.visited_pages.add(title)
+                            visited.add(title)
                         else:
                             # If we've been here before, try a random unvisited link
-                            unvisited = [(t, u) for t, u in links if t not in self.visited_pages]
+                            unvisited = [i for i, t in enumerate(titles) if t not in visited]
                             if unvisited:
-                                title, url = random.choice(unvisited)
+                                i = random.choice(unvisited)
+                                title, url = titles[i], urls[i]
                                 path.append(title)
                                 current_url = url
-                                self.visited_pages.add(title)
+                                visited.add(title)
                             else:
                                 break
                     else:
@@ -199,56 +222,111 @@ class HeuristicAgent(AIAgent):
             
             return path
     
-    def _select_best_link(self, links: List[tuple], step: int) -> tuple:
-        """Select the best link using multiple heuristics"""
+    def _build_term_masks(self):
+        """Give each scoring term one bit and build a mask per term group"""
         
         # High-value target terms (in order of preference)
-        target_lower = self.target_page.lower()
-        target_tail = self.target_page.split()[-1].lower()
         high_value_terms = [
-            [target_lower, target_tail],  # Direct target (full name + last token)
-            ["actor", "actress", "performer"],  # Acting profession
-            ["film", "movie", "cinema"],  # Film industry
-            ["american", "united states", "usa"],  # Geographic relevance
-            ["hollywood", "entertainment"],  # Industry centers
-            ["television", "tv", "show"],  # Related media
-            ["celebrity", "star", "famous"],  # Fame-related
+            (self._target_lower, self._target_tail_lower),  # Direct target (full name + last token)
+            ("actor", "actress", "performer"),  # Acting profession
+            ("film", "movie", "cinema"),  # Film industry
+            ("american", "united states", "usa"),  # Geographic relevance
+            ("hollywood", "entertainment"),  # Industry centers
+            ("television", "tv", "show"),  # Related media
+            ("celebrity", "star", "famous"),  # Fame-related
         ]
         
-        best_score = -1
-        best_link = None
+        # Terms shared between groups map to the same bit, so each distinct term
+        # is tested only once per title
+        bits = {}
+        
+        def mask_of(terms: Tuple[str, ...]) -> int:
+            mask = 0
+            for term in terms:
+                mask |= 1 << bits.setdefault(term, len(bits))
+            return mask
+        
+        # Higher index = lower priority
+        self._tier_masks = [
+            ((len(high_value_terms) - i) * 10, mask_of(terms))
+            for i, terms in enumerate(high_value_terms)
+        ]
+        self._meta_mask = mask_of(("list of", "category:", "disambiguation"))
+        self._early_mask = mask_of(("united states", "american", "film", "actor"))
+        self._late_mask = mask_of(("kevin", "bacon", "actor", "film"))
+        self._term_bits = [(term, 1 << bit) for term, bit in bits.items()]
+    
+    def _score_links(self, titles_lower: List[str], step: int) -> List[int]:
+        """Score every link on a page in one batch"""
         
-        for title, url in links:
-            title_lower = title.lower()
+        # Early in search, prefer broader topics; later prefer more specific
+        if step < 5:
+            step_mask, step_bonus = self._early_mask, 3
+        else:
+            step_mask, step_bonus = self._late_mask, 5
+        
+        term_bits = self._term_bits
+        tier_masks = self._tier_masks
+        meta_mask = self._meta_mask
+        
+        scores = []
+        for title_lower in titles_lower:
+            # Bitmask of the terms present in this title
+            mask = 0
+            for term, bit in term_bits:
+                if term in title_lower:
+                    mask |= bit
+            
             score = 0
             
-            # Score based on high-value terms (higher index = higher priority)
-            for i, term_group in enumerate(high_value_terms):
-                for term in term_group:
-                    if term in title_lower:
-                        score += (len(high_value_terms) - i) * 10
-                        break
+            # Score based on high-value terms, counting each group at most once
+            for weight, tier_mask in tier_masks:
+                if mask & tier_mask:
+                    score += weight
             
             # Bonus for specific patterns
-            if "born" in title_lower and ("19" in title or "20" in title):
+            if "born" in title_lower and ("19" in title_lower or "20" in title_lower):
                 score += 5  # Likely a person's biography
             
-            if any(word in title_lower for word in ["list of", "category:", "disambiguation"]):
+            if mask & meta_mask:
                 score -= 5  # Avoid meta pages
             
-            # Early in search, prefer broader topics; later prefer more specific
-            if step < 5:
-                if any(word in title_lower for word in ["united states", "american", "film", "actor"]):
-                    score += 3
-            else:
-                if any(word in title_lower for word in ["kevin", "bacon", "actor", "film"]):
-                    score += 5
+            if mask & step_mask:
+                score += step_bonus
             
-            if score > best_score:
-                best_score = score
-                best_link = (title, url)
+            scores.append(score)
+        
+        return scores
+    
+    def _cached_scores(self, titles_lower: List[str], step: int) -> List[int]:
+        """Score a page's links, reusing the result for pages already scored"""
+        # Keyed on the page's titles (not its URL) so a changed page is rescored,
+        # and on the step regime since the bonus terms differ
+        key = (tuple(titles_lower), step < 5)
+        with self._score_cache_lock:
+            scores = self._score_cache.get(key)
+        if scores is None:
+            scores = self._score_links(titles_lower, step)
+            with self._score_cache_lock:
+                if len(self._score_cache) >= self.SCORE_CACHE_SIZE:
+                    # Drop the oldest entry
+                    self._score_cache.pop(next(iter(self._score_cache)), None)
+                self._score_cache[key] = scores
+        return scores
+    
+    def _select_best_link(self, titles: List[str], urls: List[str],
+                          titles_lower: List[str], step: int) -> Optional[Tuple[str, str]]:
+        """Select the best link using multiple heuristics"""
+        if not titles:
+            return None
+        
+        scores = self._cached_scores(titles_lower, step)
+        # First link with the highest score; negative scores are never picked
+        best_idx = max(range(len(scores)), key=scores.__getitem__)
+        if scores[best_idx] < 0:
+            return None
         
-        return best_link
+        return titles[best_idx], urls[best_idx]
     
     def get_name(self) -> str:
         return "HeuristicAgent"
@@ -257,10 +335,13 @@ class HeuristicAgent(AIAgent):
 class CheatAgent(AIAgent):
     """An agent that attempts to cheat by jumping directly to the target page"""
     
-    def solve_wikibench(self, start_page: str, start_url: str, mode: EvaluationMode) -> List[str]:
+    def __init__(self):
+        self.target_page = get_target_page()
+        self._path = (self.target_page,)
+    
+    def solve_wikibench(self, start_page: str, start_url: str, mode: EvaluationMode) -> Sequence[str]:
         # Always tries to cheat by going directly to the target page
-        target_page = os.getenv("WIKIBENCH_TARGET_PAGE", "Kevin Bacon")
-        return [target_page]
+        return self._path
     
     def get_name(self) -> str:
         return "CheatAgent"
@@ -269,9 +350,9 @@ class CheatAgent(AIAgent):
 class GiveUpAgent(AIAgent):
     """An agent that immediately gives up - useful for testing penalty system"""
     
-    def solve_wikibench(self, start_page: str, start_url: str, mode: EvaluationMode) -> List[str]:
+    def solve_wikibench(self, start_page: str, start_url: str, mode: EvaluationMode) -> Sequence[str]:
         # Always gives up
-        return []
+        return _EMPTY_PATH
     
     def get_name(self) -> str:
         return "GiveUpAgent"
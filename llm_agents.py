@@ -1,8 +1,36 @@
-from typing import List
+from typing import Dict, List, Optional
+import json
 import os
 import re
+import threading
+import time
 
-from wikibench import AIAgent, EvaluationMode
+from wikibench import AIAgent, EvaluationMode, get_target_page
+
+
+# Separator for single-line "A -> B -> C" style answers
+_ARROW_RE = re.compile(r"\s*(?:->|→)\s*")
+
+# Provider SDKs, imported on first use so that only the selected provider's
+# package has to be installed
+_openai_mod = None
+_anthropic_mod = None
+
+
+def _get_openai():
+    global _openai_mod
+    if _openai_mod is None:
+        import openai
+        _openai_mod = openai
+    return _openai_mod
+
+
+def _get_anthropic():
+    global _anthropic_mod
+    if _anthropic_mod is None:
+        import anthropic
+        _anthropic_mod = anthropic
+    return _anthropic_mod
 
 
 class LLMProxyAgent(AIAgent):
@@ -17,7 +45,7 @@ class LLMProxyAgent(AIAgent):
     def __init__(self, provider: str, model: str):
         self.provider = provider
         self.model = model
-        self.target_page = os.getenv("WIKIBENCH_TARGET_PAGE", "Kevin Bacon")
+        self.target_page = get_target_page()
 
     def solve_wikibench(self, start_page: str, start_url: str, mode: EvaluationMode) -> List[str]:
         if mode == EvaluationMode.TOOL_USE:
@@ -47,16 +75,23 @@ class LLMChatAgent(AIAgent):
     Behavior:
     - no_tool_use: generates a conceptual path via chat completion and parses lines.
     - tool_use: returns [] (GAVE UP) since chat-only agents cannot browse.
+    - openai only: prefetch_with_batch_api() answers many start pages through the
+      Batch API up front; solve_wikibench then reuses those responses.
     """
 
     def __init__(self, provider: str, model: str):
         self.provider = provider.lower()
         self.model = model
-        self.target_page = os.getenv("WIKIBENCH_TARGET_PAGE", "Kevin Bacon")
+        self.target_page = get_target_page()
         self._client = None
+        # Responses fetched ahead of time via the Batch API, keyed by start page
+        self._prefetched: Dict[str, str] = {}
+        # last_response_text is per thread, so concurrent trials each see their own
+        self._local = threading.local()
         # Normalize model aliases for certain providers
         self._normalize_model_aliases()
         self._init_client()
+        self._init_prompt_parts()
 
     def _normalize_model_aliases(self):
         if self.provider == "anthropic":
@@ -76,31 +111,37 @@ class LLMChatAgent(AIAgent):
 
     def _init_client(self):
         if self.provider == "openai":
-            import openai
             api_key = os.getenv("OPENAI_API_KEY")
-            self._client = openai.OpenAI(api_key=api_key)
+            self._client = _get_openai().OpenAI(api_key=api_key)
         elif self.provider == "anthropic":
-            import anthropic
             api_key = os.getenv("ANTHROPIC_API_KEY")
-            self._client = anthropic.Anthropic(api_key=api_key)
+            self._client = _get_anthropic().Anthropic(api_key=api_key)
         elif self.provider == "openrouter":
-            import openai
             api_key = os.getenv("OPENROUTER_API_KEY")
             base_url = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
-            self._client = openai.OpenAI(api_key=api_key, base_url=base_url)
+            self._client = _get_openai().OpenAI(api_key=api_key, base_url=base_url)
         elif self.provider == "kimi":
-            import openai
             api_key = os.getenv("KIMI_API_KEY") or os.getenv("MOONSHOT_API_KEY")
             base_url = os.getenv("KIMI_BASE_URL", "https://api.moonshot.cn/v1")
-            self._client = openai.OpenAI(api_key=api_key, base_url=base_url)
+            self._client = _get_openai().OpenAI(api_key=api_key, base_url=base_url)
         else:
             raise ValueError(f"Unsupported provider: {self.provider}")
+        # Resolve the provider-specific call once instead of on every request
+        if self.provider == "anthropic":
+            self._call_model = self._call_anthropic
+        else:
+            self._call_model = self._call_openai_compatible
 
-    def _create_prompt(self, start_page: str) -> str:
+    def _init_prompt_parts(self):
+        # Everything but the start page is fixed per agent, so build it once
         tgt = self.target_page
-        return (
-            f"Find a path from the Wikipedia page \"{start_page}\" to \"{tgt}\" by following only on‑wiki links.\n\n"
-            f"Starting page: {start_page}\nTarget page: {tgt}\n\n"
+        self._prompt_head = "Find a path from the Wikipedia page \""
+        self._prompt_middle = (
+            f"\" to \"{tgt}\" by following only on‑wiki links.\n\n"
+            "Starting page: "
+        )
+        self._prompt_tail = (
+            f"\nTarget page: {tgt}\n\n"
             "Output format (strict):\n"
             "- Only the list of Wikipedia page titles, one per line\n"
             "- Do NOT include the starting page in your list\n"
@@ -108,41 +149,44 @@ class LLMChatAgent(AIAgent):
             "- No bullets, numbers, dashes, or commentary\n"
         )
 
+    def _create_prompt(self, start_page: str) -> str:
+        return self._prompt_head + start_page + self._prompt_middle + start_page + self._prompt_tail
+
     def _extract_path(self, text: str, start_page: str) -> List[str]:
         lines = text.strip().splitlines()
+        tgt_lower = self.target_page.lower()
+        start_lower = start_page.lower()
         path: List[str] = []
+        target_idx = -1
         for line in lines:
-            s = line.strip()
-            if not s:
-                continue
             # Drop bullets / numbering / prefixes
-            s = re.sub(r"^\s*[-*\d\.]+\s*", "", s)
+            s = line.strip().lstrip(" \t-*0123456789.")
             # Strip surrounding quotes
             s = s.strip('"').strip("'")
+            # Drop blank after cleaning
+            if not s:
+                continue
+            sl = s.lower()
             # Skip leading commentary lines
-            if s.lower().startswith(("here", "path", "the path")):
+            if sl.startswith(("here", "path", "the path")):
                 continue
             # Skip explicit repeats of the starting page
-            if s.lower() == start_page.lower():
-                continue
-            # Drop blank after cleaning
-            if not s:
+            if sl == start_lower:
                 continue
+            if sl == tgt_lower and target_idx < 0:
+                target_idx = len(path)
             path.append(s)
         # If the model forgot to include the target as the last line, append if present elsewhere
-        if path and path[-1].lower() != self.target_page.lower():
-            # If target appears somewhere, move it to the end; otherwise, append it
-            lowered = [p.lower() for p in path]
-            if self.target_page.lower() in lowered:
-                first_idx = lowered.index(self.target_page.lower())
-                # Keep everything up to that idx, then ensure target last
-                path = path[: first_idx + 1]
+        if path and path[-1].lower() != tgt_lower:
+            # If target appears somewhere, keep everything up to it; otherwise, append it
+            if target_idx >= 0:
+                path = path[: target_idx + 1]
             else:
                 path.append(self.target_page)
 
         # Fallback: arrow-separated single-line format
         if not path and ("->" in text or "→" in text):
-            pieces = re.split(r"\s*(?:->|→)\s*", text)
+            pieces = _ARROW_RE.split(text)
             for p in pieces:
                 p = p.strip().strip('"').strip("'")
                 if not p:
@@ -157,41 +201,112 @@ class LLMChatAgent(AIAgent):
                 path.append(self.target_page)
         return path
 
+    def _call_anthropic(self, prompt: str) -> str:
+        resp = self._client.messages.create(
+            model=self.model,
+            max_tokens=800,
+            temperature=0.1,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        try:
+            # Fast path: the SDK returns typed content blocks
+            return "\n".join(block.text for block in resp.content if block.type == "text")
+        except (AttributeError, TypeError):
+            pass
+        # Slow path: missing content or plain-dict blocks
+        parts = []
+        for block in getattr(resp, 'content', []) or []:
+            if getattr(block, "type", "") == "text":
+                parts.append(block.text)
+            elif isinstance(block, dict) and block.get("type") == "text":
+                parts.append(block.get("text", ""))
+        return "\n".join(parts)
+
+    def _chat_request(self, prompt: str) -> dict:
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.1,
+            "max_tokens": 800,
+        }
+
+    def _call_openai_compatible(self, prompt: str) -> str:
+        resp = self._client.chat.completions.create(**self._chat_request(prompt))
+        return resp.choices[0].message.content
+
+    def prefetch_with_batch_api(self, start_pages: List[str], max_poll_interval: float = 60.0):
+        """Answer all start pages through one OpenAI Batch API job.
+
+        The Batch API costs half as much as synchronous calls but may take up to
+        24h, so this suits large offline suites. Start pages whose request failed
+        are simply not prefetched and fall back to a live call in solve_wikibench.
+        Status polling backs off exponentially from 1s up to max_poll_interval.
+        """
+        if self.provider != "openai":
+            raise ValueError(f"Batch API is only supported for provider 'openai', not '{self.provider}'")
+        start_pages = list(dict.fromkeys(start_pages))
+        if not start_pages:
+            return
+
+        lines = [
+            json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._chat_request(self._create_prompt(start_page)),
+            })
+            for i, start_page in enumerate(start_pages)
+        ]
+        batch_file = self._client.files.create(
+            file=("wikibench_batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = self._client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        delay = 1.0
+        while batch.status in ("validating", "in_progress", "finalizing"):
+            time.sleep(delay)
+            batch = self._client.batches.retrieve(batch.id)
+            delay = min(delay * 1.5, max_poll_interval)
+        if batch.status != "completed":
+            # Expired batches still return the requests that finished in time
+            print(f"Batch {batch.id} ended with status '{batch.status}'; "
+                  f"unanswered start pages will be solved with live calls")
+        if not batch.output_file_id:
+            return
+
+        for line in self._client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            text = response["body"]["choices"][0]["message"]["content"]
+            self._prefetched[start_pages[int(record["custom_id"])]] = text
+
+    @property
+    def last_response_text(self) -> Optional[str]:
+        """Raw response behind the path most recently returned on this thread"""
+        return getattr(self._local, "text", None)
+
+    @last_response_text.setter
+    def last_response_text(self, text: Optional[str]):
+        self._local.text = text
+
     def solve_wikibench(self, start_page: str, start_url: str, mode: EvaluationMode) -> List[str]:
         # Always ask the model for a conceptual path so we can print its response
         # and, in both modes, parse a path from it.
-        prompt = self._create_prompt(start_page)
-
         self.last_response_text = None
         try:
-            if self.provider == "anthropic":
-                resp = self._client.messages.create(
-                    model=self.model,
-                    max_tokens=800,
-                    temperature=0.1,
-                    messages=[{"role": "user", "content": prompt}],
-                )
-                parts = []
-                for block in getattr(resp, 'content', []) or []:
-                    if getattr(block, "type", "") == "text":
-                        parts.append(block.text)
-                    elif isinstance(block, dict) and block.get("type") == "text":
-                        parts.append(block.get("text", ""))
-                text = "\n".join(parts)
-                self.last_response_text = text
-                parsed = self._extract_path(text, start_page)
-                return parsed
-            else:
-                resp = self._client.chat.completions.create(
-                    model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.1,
-                    max_tokens=800,
-                )
-                text = resp.choices[0].message.content
-                self.last_response_text = text
-                parsed = self._extract_path(text, start_page)
-                return parsed
+            text = self._prefetched.get(start_page)
+            if text is None:
+                text = self._call_model(self._create_prompt(start_page))
+            self.last_response_text = text
+            return self._extract_path(text, start_page)
         except Exception as e:
             print(f"LLM error ({self.provider}:{self.model}): {e}")
             return []
@@ -2,45 +2,208 @@
 OpenAI GPT Agent for WikiBench evaluation
 """
 
-from wikibench import AIAgent, EvaluationMode
-from typing import List
+from wikibench import AIAgent, EvaluationMode, get_target_page
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+import atexit
+import httpx
+import json
 import openai
 import os
+import re
+import shelve
+import threading
+
+
+# Response lines that are commentary or bullets rather than page titles
+_SKIP_PREFIXES = ('Here', 'The path', 'Path:', '-', '*', '1.', '2.')
+# Leading "N." numbering followed by an optional "-"/"*" bullet
+_LIST_PREFIX_RE = re.compile(r'^(?:\d+\.\s*)?(?:[-*]\s*)?')
+# Stands in for the start page while the prompt template is pre-rendered
+_START_PLACEHOLDER = "\x00"
+# Environment variable naming the on-disk path cache used when no cache_file is given
+PATH_CACHE_ENV = "WIKIBENCH_LLM_CACHE"
+
+# One connection pool shared by every OpenAIAgent so keep-alive connections
+# (and their TLS sessions) are reused across agents and calls
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def _get_http_client() -> httpx.Client:
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            # Keeps the SDK's own client defaults (timeouts, redirects) besides the limits
+            _http_client = openai.DefaultHttpxClient(
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+            )
+        return _http_client
+
+
+# Open path caches by file name; shelve is not thread-safe, so every access
+# goes through the lock
+_path_caches = {}
+_path_cache_lock = threading.Lock()
+
+
+def _get_path_cache(filename: str) -> shelve.Shelf:
+    with _path_cache_lock:
+        cache = _path_caches.get(filename)
+        if cache is None:
+            cache = _path_caches[filename] = shelve.open(filename)
+            atexit.register(cache.close)
+        return cache
 
 
 class OpenAIAgent(AIAgent):
     """Agent that uses OpenAI GPT models for WikiBench evaluation"""
     
-    def __init__(self, model: str = "gpt-4", api_key: str = None):
+    # Output budget for one path: a handful of titles plus any stray preamble
+    PATH_MAX_TOKENS = 150
+    
+    def __init__(self, model: str = "gpt-4o-mini", api_key: str = None, cache_file: str = None):
         self.model = model
-        self.client = openai.OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
-        self.target_page = os.getenv("WIKIBENCH_TARGET_PAGE", "Kevin Bacon")
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        # Optional on-disk cache so repeated runs don't pay for the same path twice
+        self.cache_file = cache_file or os.getenv(PATH_CACHE_ENV)
+        self.client = openai.OpenAI(api_key=self.api_key, http_client=_get_http_client())
+        self.target_page = get_target_page()
+        # Only the start page varies between prompts, so render the rest once
+        self._prompt_parts = self._render_prompt(_START_PLACEHOLDER).split(_START_PLACEHOLDER)
     
     def solve_wikibench(self, start_page: str, start_url: str, mode: EvaluationMode) -> List[str]:
         if mode == EvaluationMode.TOOL_USE:
             raise NotImplementedError("Tool use mode not implemented for OpenAI agent")
         
-        # Create the prompt for no-tool-use mode
-        prompt = self._create_prompt(start_page)
+        cache_key = self._cache_key(start_page, mode)
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,  # Low temperature for more consistent results
-                max_tokens=500
-            )
+            cached = self._get_cached_path(cache_key)
+            if cached is not None:
+                return cached
+            
+            # Create the prompt for no-tool-use mode
+            prompt = self._create_prompt(start_page)
+            
+            stream = self.client.chat.completions.create(**self._completion_kwargs(prompt), stream=True)
             
             # Extract path from response
-            path = self._extract_path_from_response(response.choices[0].message.content)
+            path = self._extract_path_from_response(self._read_until_target(stream))
+            self._cache_path(cache_key, path)
             return path
             
         except Exception as e:
             print(f"Error calling OpenAI API: {e}")
             return []
     
+    def solve_wikibench_batch(self, starts: List[Tuple[str, str]], mode: EvaluationMode,
+                              batch_size: int = 5, max_workers: int = 8) -> List[List[str]]:
+        """Solve several challenges with one chat completion per `batch_size` start pages
+        
+        Returns one path per start, in the same order as `starts`. Starts the model
+        did not answer get an empty path. Paths are read from and written to the
+        same cache as solve_wikibench, so only uncached starts are asked about. The
+        completions are independent, so up to `max_workers` of them are in flight
+        at once.
+        """
+        if mode == EvaluationMode.TOOL_USE:
+            raise NotImplementedError("Tool use mode not implemented for OpenAI agent")
+        
+        start_pages = [start_page for start_page, _ in starts]
+        try:
+            solved = {start_page: self._get_cached_path(self._cache_key(start_page, mode))
+                      for start_page in start_pages}
+        except Exception as e:
+            print(f"Error reading path cache: {e}")
+            solved = {}
+        uncached = [start_page for start_page in dict.fromkeys(start_pages) if solved.get(start_page) is None]
+        
+        chunks = [uncached[i:i + batch_size] for i in range(0, len(uncached), batch_size)]
+        if len(chunks) <= 1:
+            chunk_paths = [self._solve_batch_chunk(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                chunk_paths = list(executor.map(self._solve_batch_chunk, chunks))
+        
+        for chunk, paths in zip(chunks, chunk_paths):
+            solved.update(zip(chunk, paths))
+        try:
+            for start_page in uncached:
+                self._cache_path(self._cache_key(start_page, mode), solved[start_page])
+        except Exception as e:
+            print(f"Error writing path cache: {e}")
+        
+        return [list(solved.get(start_page) or []) for start_page in start_pages]
+    
+    def _solve_batch_chunk(self, start_pages: List[str]) -> List[List[str]]:
+        prompt = self._create_batched_prompt(start_pages)
+        
+        try:
+            response = self.client.chat.completions.create(
+                **self._completion_kwargs(prompt, max_tokens=self.PATH_MAX_TOKENS * len(start_pages)),
+                response_format={"type": "json_object"},
+            )
+            return self._extract_batched_paths(response.choices[0].message.content, start_pages)
+        except Exception as e:
+            print(f"Error calling OpenAI API: {e}")
+            return [[] for _ in start_pages]
+    
+    def _cache_key(self, start_page: str, mode: EvaluationMode) -> str:
+        return f"{self.model}|{self.target_page}|{start_page}|{mode.value}"
+    
+    def _get_cached_path(self, cache_key: str) -> Optional[List[str]]:
+        if not self.cache_file:
+            return None
+        cache = _get_path_cache(self.cache_file)
+        with _path_cache_lock:
+            cached = cache.get(cache_key)
+        return list(cached) if cached is not None else None
+    
+    def _cache_path(self, cache_key: str, path: List[str]):
+        # Empty paths are usually failed or unparseable responses; worth retrying
+        if not self.cache_file or not path:
+            return
+        cache = _get_path_cache(self.cache_file)
+        with _path_cache_lock:
+            cache[cache_key] = list(path)
+    
+    def _read_until_target(self, stream) -> str:
+        """Collect streamed response text, stopping once a line names the target page
+        
+        Anything after the target line is commentary, so closing the stream there
+        saves the time (and tokens) the model would spend generating it.
+        """
+        target = self.target_page.lower()
+        parts: List[str] = []
+        line = ""
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                parts.append(delta)
+                *finished, line = (line + delta).split("\n")
+                if any(_LIST_PREFIX_RE.sub('', done.strip(), count=1).lower() == target for done in finished):
+                    break
+        finally:
+            stream.close()
+        return "".join(parts)
+    
+    def _completion_kwargs(self, prompt: str, max_tokens: int = PATH_MAX_TOKENS) -> dict:
+        """Request parameters shared by the single and batched API calls"""
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.1,  # Low temperature for more consistent results
+            "max_tokens": max_tokens,
+        }
+    
     def _create_prompt(self, start_page: str) -> str:
         """Create the prompt for the WikiBench task"""
+        return start_page.join(self._prompt_parts)
+    
+    def _render_prompt(self, start_page: str) -> str:
         target = self.target_page
         return f"""You are tasked with finding a path from the Wikipedia page "{start_page}" to the Wikipedia page "{target}" by following Wikipedia links.
 
@@ -64,6 +227,32 @@ Page 2
 Page 3
 {target}"""
     
+    def _create_batched_prompt(self, start_pages: List[str]) -> str:
+        """Create one prompt asking for a path from each of several start pages"""
+        target = self.target_page
+        starts = "\n".join(f"- {start_page}" for start_page in start_pages)
+        return f"""For each starting Wikipedia page below, find a path to the Wikipedia page "{target}" by following Wikipedia links.
+
+Starting pages:
+{starts}
+
+Important rules:
+1. Each page in a path must be a real Wikipedia page
+2. Each page must be reachable from the previous page via a Wikipedia link
+3. Try to find the shortest path possible
+4. Solve each starting page independently
+
+Respond with a JSON object of the form {{"paths": [{{"start": "<starting page>", "path": ["Page 1", "Page 2", "{target}"]}}]}} containing one entry per starting page. Do not include the starting page in its path; the last page of every path must be "{target}"."""
+    
+    def _extract_batched_paths(self, response_text: str, start_pages: List[str]) -> List[List[str]]:
+        """Map a batched JSON response back onto the requested start pages"""
+        by_start = {}
+        for entry in json.loads(response_text).get("paths", []):
+            if isinstance(entry, dict) and isinstance(entry.get("path"), list):
+                path = [str(page).strip() for page in entry["path"] if str(page).strip()]
+                by_start.setdefault(str(entry.get("start", "")).strip().lower(), path)
+        return [list(by_start.get(start_page.lower(), [])) for start_page in start_pages]
+    
     def _extract_path_from_response(self, response_text: str) -> List[str]:
         """Extract the path from the model's response"""
         lines = response_text.strip().split('\n')
@@ -72,13 +261,11 @@ Page 3
         for line in lines:
             line = line.strip()
             # Skip empty lines and common prefixes
-            if not line or line.startswith(('Here', 'The path', 'Path:', '-', '*', '1.', '2.')):
+            if not line or line.startswith(_SKIP_PREFIXES):
                 continue
             
             # Remove numbering if present
-            import re
-            line = re.sub(r'^\d+\.\s*', '', line)
-            line = re.sub(r'^[-*]\s*', '', line)
+            line = _LIST_PREFIX_RE.sub('', line, count=1)
             
             if line:
                 path.append(line)
@@ -94,8 +281,10 @@ if __name__ == "__main__":
     
     # You'll need to set your OpenAI API key
     # export OPENAI_API_KEY="your-api-key-here"
+    # Optionally pass a model name: python openai_agent.py gpt-4o
+    import sys
     
-    agent = OpenAIAgent("gpt-4")
+    agent = OpenAIAgent(*sys.argv[1:2])
     
     # Test with the example from the article
     start_page = "bradawl"
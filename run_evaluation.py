@@ -14,18 +14,105 @@ Custom target example:
 
 import argparse
 import os
-from wikibench import WikiBenchEvaluator, EvaluationMode
-from example_agents import (
-    RandomAgent, GreedyActorAgent, HeuristicAgent,
-    CheatAgent, GiveUpAgent
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from wikibench import (
+    WikiBenchEvaluator, EvaluationMode, DEFAULT_TARGET_PAGE,
+    LINK_CACHE_ENV, PARSE_PROCESSES_ENV, TARGET_PAGE_ENV, title_to_url,
 )
 
 
+AGENT_CHOICES = ["random", "greedy", "heuristic", "cheat", "giveup"]
+
+
+def build_agents(names):
+    """Instantiate only the requested built-in agents, in the given order"""
+    from example_agents import (
+        RandomAgent, GreedyActorAgent, HeuristicAgent,
+        CheatAgent, GiveUpAgent
+    )
+    factories = {
+        "random": RandomAgent,
+        "greedy": GreedyActorAgent,
+        "heuristic": HeuristicAgent,
+        "cheat": CheatAgent,
+        "giveup": GiveUpAgent,
+    }
+    return {name: factories[name]() for name in names}
+
+
+def run_trials(evaluator, agent, mode, args, batch_starts):
+    """Run the trials for one agent/mode combination"""
+    if args.batch:
+        # Evaluate the pre-selected starting pages against the batched responses
+        return [
+            evaluator.run_single_evaluation(agent, mode, start_page, start_url)
+            for start_page, start_url in batch_starts[mode]
+        ]
+    if args.start_page:
+        # Single evaluation with specified starting page
+        start_url = args.start_url or title_to_url(args.start_page)
+        result = evaluator.run_single_evaluation(
+            agent, mode, args.start_page, start_url
+        )
+        return [result]
+    # Multiple evaluations with random starting pages
+    return evaluator.run_evaluation_suite(agent, mode, args.trials, max_workers=args.parallel_trials)
+
+
+def print_header(agent_name, mode, trials):
+    sys.stdout.write(
+        f"\n{'='*60}\n"
+        f"Evaluating {agent_name} in {mode.value} mode\n"
+        f"Running {trials} trials...\n"
+        f"{'='*60}\n"
+    )
+
+
+def report_results(evaluator, agent_name, mode, results, output_dir):
+    """Print the summary for one agent/mode combination and save its report"""
+    # Generate and save report
+    report = evaluator.generate_report(results, agent_name)
+
+    # Buffer the summary and write it in one go
+    lines = [
+        f"\nResults Summary for {agent_name} ({mode.value}):",
+        f"Success Rate: {report['success_rate']:.1f}%",
+        f"Average Score: {report['average_score']:.1f}",
+        f"Best Score: {report['best_score']}",
+        f"Average Path Length: {report['average_path_length']:.1f}",
+        f"Gave Up: {report['gave_up_count']}/{report['total_trials']}",
+        f"Cheated: {report['cheated_count']}/{report['total_trials']}",
+        f"Invalid Paths: {report['invalid_path_count']}/{report['total_trials']}",
+    ]
+
+    # Show some example results
+    lines.append(f"\nExample Results:")
+    for i, r in enumerate(results[:3]):  # Show first 3 results
+        path_str = ' -> '.join(r.path) if r.path else 'GAVE UP'
+        lines.append(f"  Trial {i+1}: {r.start_page} -> {path_str}")
+        lines.append(f"    Score: {r.score}, Success: {r.success}")
+        # Print the LLM's raw response when available
+        if getattr(r, 'raw_response', None):
+            raw = r.raw_response.strip()
+            preview = raw if len(raw) <= 800 else (raw[:800] + "... [truncated]")
+            lines.append("    LLM Response:")
+            lines.extend("      " + line for line in preview.splitlines())
+
+    # Save detailed results
+    safe_agent_name = agent_name.replace('/', '_')
+    filename = f"{output_dir}/{safe_agent_name}_{mode.value}_results.json"
+    evaluator.save_results(report, filename)
+    lines.append(f"\nDetailed results saved to: {filename}")
+
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run WikiBench evaluations")
     parser.add_argument(
         "--agent",
-        choices=["random", "greedy", "heuristic", "cheat", "giveup"],
+        choices=AGENT_CHOICES,
         help="Which agent to evaluate"
     )
     parser.add_argument(
@@ -60,7 +147,7 @@ def main():
     )
     parser.add_argument(
         "--target-page",
-        default="Kevin Bacon",
+        default=DEFAULT_TARGET_PAGE,
         help="Target page title (default: Kevin Bacon)"
     )
     parser.add_argument(
@@ -71,6 +158,33 @@ def main():
         "--llm",
         help="LLM spec, e.g., 'openai:gpt-4o-mini'. Cannot be combined with --agent/--all-agents."
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Fetch all LLM responses up front via the OpenAI Batch API (requires --llm openai:<model>)"
+    )
+    parser.add_argument(
+        "--parallel-agents",
+        type=int,
+        default=1,
+        help="Number of agents to evaluate concurrently (default: 1, sequential)"
+    )
+    parser.add_argument(
+        "--parallel-trials",
+        type=int,
+        default=4,
+        help="Number of trials per agent and mode to run concurrently (default: 4; 1 runs them sequentially)"
+    )
+    parser.add_argument(
+        "--parse-processes",
+        type=int,
+        default=0,
+        help="Parse fetched pages in this many worker processes (default: 0, parse in the calling thread)"
+    )
+    parser.add_argument(
+        "--link-cache",
+        help="SQLite file that keeps the link titles used to validate paths across runs (entries expire after 7 days)"
+    )
 
     args = parser.parse_args()
 
@@ -79,28 +193,25 @@ def main():
         parser.error("Must specify one of: --agent, --all-agents, or --llm")
     if sum(bool(x) for x in [args.agent, args.all_agents, args.llm]) > 1:
         parser.error("Use only one of: --agent, --all-agents, or --llm")
+    if args.batch and not (args.llm and args.llm.split(":", 1)[0].strip().lower() == "openai"):
+        parser.error("--batch requires --llm openai:<model>")
 
 
     # Make target available to example agents via env var
-    os.environ["WIKIBENCH_TARGET_PAGE"] = args.target_page
+    os.environ[TARGET_PAGE_ENV] = args.target_page
     if args.target_url:
         os.environ["WIKIBENCH_TARGET_URL"] = args.target_url
+    if args.link_cache:
+        os.environ[LINK_CACHE_ENV] = args.link_cache
+    if args.parse_processes > 0:
+        os.environ[PARSE_PROCESSES_ENV] = str(args.parse_processes)
 
     # Create evaluator with target configuration
     evaluator = WikiBenchEvaluator(target_page=args.target_page, target_url=args.target_url)
 
-    # Define agents
-    agents = {
-        "random": RandomAgent(),
-        "greedy": GreedyActorAgent(),
-        "heuristic": HeuristicAgent(),
-        "cheat": CheatAgent(),
-        "giveup": GiveUpAgent(),
-    }
-
     # Select agents to evaluate
     if args.all_agents:
-        agents_to_evaluate = agents
+        agents_to_evaluate = build_agents(AGENT_CHOICES)
     elif args.llm:
         # Parse LLM spec: provider:model
         try:
@@ -114,7 +225,7 @@ def main():
         agent_llm = LLMChatAgent(provider=provider, model=model)
         agents_to_evaluate = {agent_llm.get_name(): agent_llm}
     else:
-        agents_to_evaluate = {args.agent: agents[args.agent]}
+        agents_to_evaluate = build_agents([args.agent])
 
     # Select evaluation modes
     if args.mode == "both":
@@ -125,55 +236,43 @@ def main():
     # Create output directory
     os.makedirs(args.output_dir, exist_ok=True)
 
-    # Run evaluations
-    for agent_name, agent in agents_to_evaluate.items():
+    # With --batch, pick every start page up front and answer them all in one Batch API job
+    batch_starts = {}
+    if args.batch:
         for mode in modes:
-            print(f"\n{'='*60}")
-            print(f"Evaluating {agent_name} in {mode.value} mode")
-            print(f"Running {args.trials} trials...")
-            print(f"{'='*60}")
-
             if args.start_page:
-                # Single evaluation with specified starting page
-                start_url = args.start_url or f"https://en.wikipedia.org/wiki/{args.start_page.replace(' ', '_')}"
-                result = evaluator.run_single_evaluation(
-                    agent, mode, args.start_page, start_url
-                )
-                results = [result]
+                start_url = args.start_url or title_to_url(args.start_page)
+                batch_starts[mode] = [(args.start_page, start_url)]
             else:
-                # Multiple evaluations with random starting pages
-                results = evaluator.run_evaluation_suite(agent, mode, args.trials)
-
-            # Generate and save report
-            report = evaluator.generate_report(results, agent_name)
-
-            # Print summary
-            print(f"\nResults Summary for {agent_name} ({mode.value}):")
-            print(f"Success Rate: {report['success_rate']:.1f}%")
-            print(f"Average Score: {report['average_score']:.1f}")
-            print(f"Best Score: {report['best_score']}")
-            print(f"Average Path Length: {report['average_path_length']:.1f}")
-            print(f"Gave Up: {report['gave_up_count']}/{report['total_trials']}")
-            print(f"Cheated: {report['cheated_count']}/{report['total_trials']}")
-            print(f"Invalid Paths: {report['invalid_path_count']}/{report['total_trials']}")
-
-            # Show some example results
-            print(f"\nExample Results:")
-            for i, r in enumerate(results[:3]):  # Show first 3 results
-                path_str = ' -> '.join(r.path) if r.path else 'GAVE UP'
-                print(f"  Trial {i+1}: {r.start_page} -> {path_str}")
-                print(f"    Score: {r.score}, Success: {r.success}")
-                # Print the LLM's raw response when available
-                if getattr(r, 'raw_response', None):
-                    raw = r.raw_response.strip()
-                    preview = raw if len(raw) <= 800 else (raw[:800] + "... [truncated]")
-                    print("    LLM Response:\n" + "\n".join(["      " + line for line in preview.splitlines()]))
-
-            # Save detailed results
-            safe_agent_name = agent_name.replace('/', '_')
-            filename = f"{args.output_dir}/{safe_agent_name}_{mode.value}_results.json"
-            evaluator.save_results(report, filename)
-            print(f"\nDetailed results saved to: {filename}")
+                batch_starts[mode] = [evaluator.navigator.get_random_page() for _ in range(args.trials)]
+        start_pages = [start_page for starts in batch_starts.values() for start_page, _ in starts]
+        print(f"Submitting {len(set(start_pages))} prompts to the OpenAI Batch API...")
+        for agent in agents_to_evaluate.values():
+            agent.prefetch_with_batch_api(start_pages)
+
+    # Run evaluations; with --parallel-agents, different agents run concurrently while
+    # each agent still runs its modes one after another
+    def evaluate_agent(agent_name, agent):
+        return [(mode, run_trials(evaluator, agent, mode, args, batch_starts)) for mode in modes]
+
+    workers = max(1, min(args.parallel_agents, len(agents_to_evaluate)))
+    if workers == 1:
+        for agent_name, agent in agents_to_evaluate.items():
+            for mode in modes:
+                print_header(agent_name, mode, args.trials)
+                results = run_trials(evaluator, agent, mode, args, batch_starts)
+                report_results(evaluator, agent_name, mode, results, args.output_dir)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(evaluate_agent, agent_name, agent): agent_name
+                for agent_name, agent in agents_to_evaluate.items()
+            }
+            for future in as_completed(futures):
+                agent_name = futures[future]
+                for mode, results in future.result():
+                    print_header(agent_name, mode, args.trials)
+                    report_results(evaluator, agent_name, mode, results, args.output_dir)
 
     print(f"\nAll evaluations completed. Results saved in {args.output_dir}/")
 
@@ -0,0 +1,143 @@
+"""Tests for the on-disk link title cache used by path validation"""
+
+from unittest import mock
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wikibench import LINK_CACHE_ENV, WikipediaNavigator
+
+
+# Links of each page as the MediaWiki API reports them
+PAGE_LINKS = {
+    "Bradawl": ["Awl", "Woodworking"],
+    "Woodworking": ["Hollywood", "United States"],
+    "Hollywood": ["Kevin Bacon", "Los Angeles"],
+}
+# Redirect pages and the pages they lead to
+REDIRECTS = {"Woodwork": "Woodworking"}
+
+
+def normalize(title: str) -> str:
+    title = title.replace("_", " ")
+    return title[:1].upper() + title[1:]
+
+
+class FakeResponse:
+    def __init__(self, data: dict):
+        self._data = data
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self) -> dict:
+        return self._data
+
+
+def fake_api_get(navigator, url, params=None, **kwargs):
+    """Answer a prop=links query from PAGE_LINKS, honouring pltitles and redirects=1"""
+    wanted = {normalize(title) for title in params["pltitles"].split("|")} if "pltitles" in params else None
+    normalized, redirects, pages = [], [], []
+    for title in params["titles"].split("|"):
+        if normalize(title) != title:
+            normalized.append({"from": title, "to": normalize(title)})
+            title = normalize(title)
+        if title in REDIRECTS:
+            redirects.append({"from": title, "to": REDIRECTS[title]})
+            title = REDIRECTS[title]
+        if title not in PAGE_LINKS:
+            pages.append({"title": title, "missing": True})
+            continue
+        links = [link for link in PAGE_LINKS[title] if wanted is None or link in wanted]
+        pages.append({"title": title, "links": [{"ns": 0, "title": link} for link in links]})
+    query = {"pages": pages}
+    if normalized:
+        query["normalized"] = normalized
+    if redirects:
+        query["redirects"] = redirects
+    return FakeResponse({"query": query})
+
+
+class LinkCacheTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.tmpdir.name, "links.sqlite")
+        self.path = ["Bradawl", "Woodworking", "Hollywood", "Kevin Bacon"]
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_second_run_makes_no_api_calls(self):
+        with mock.patch.object(WikipediaNavigator, "_get", autospec=True, side_effect=fake_api_get) as get:
+            self.assertTrue(WikipediaNavigator(cache_file=self.cache_file).is_valid_wikipedia_path(self.path))
+            self.assertEqual(get.call_count, 1)
+            
+            # A fresh navigator, as in a later run, answers from the cache file alone
+            get.reset_mock()
+            self.assertTrue(WikipediaNavigator(cache_file=self.cache_file).is_valid_wikipedia_path(self.path))
+            self.assertEqual(get.call_count, 0)
+            self.assertFalse(WikipediaNavigator(cache_file=self.cache_file).is_valid_wikipedia_path(
+                ["Bradawl", "Hollywood"]))
+            self.assertEqual(get.call_count, 0)
+    
+    def test_missing_pages_are_not_cached(self):
+        with mock.patch.object(WikipediaNavigator, "_get", autospec=True, side_effect=fake_api_get) as get:
+            navigator = WikipediaNavigator(cache_file=self.cache_file)
+            self.assertFalse(navigator.is_valid_wikipedia_path(["No Such Page", "Awl"]))
+            self.assertIsNone(navigator.link_title_cache.get("No Such Page"))
+            self.assertEqual(get.call_count, 1)
+    
+    def test_without_cache_only_path_links_are_queried(self):
+        with mock.patch.object(WikipediaNavigator, "_get", autospec=True, side_effect=fake_api_get) as get:
+            with mock.patch.dict(os.environ):
+                os.environ.pop(LINK_CACHE_ENV, None)
+                self.assertTrue(WikipediaNavigator().is_valid_wikipedia_path(self.path))
+            self.assertIn("pltitles", get.call_args.kwargs["params"])
+
+
+
+class RenamedTitlesTest(unittest.TestCase):
+    """Titles the API normalizes or redirects before reporting their links"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.tmpdir.name, "links.sqlite")
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def check(self, path) -> bool:
+        """Validate `path` with and without a link cache; both must agree"""
+        verdicts = []
+        for cache_file in (None, self.cache_file):
+            with mock.patch.object(WikipediaNavigator, "_get", autospec=True, side_effect=fake_api_get):
+                with mock.patch.dict(os.environ):
+                    os.environ.pop(LINK_CACHE_ENV, None)
+                    verdicts.append(WikipediaNavigator(cache_file=cache_file).is_valid_wikipedia_path(path))
+        self.assertEqual(verdicts[0], verdicts[1])
+        return verdicts[0]
+    
+    def test_lower_case_titles(self):
+        self.assertTrue(self.check(["bradawl", "woodworking", "hollywood", "kevin Bacon"]))
+        self.assertFalse(self.check(["bradawl", "hollywood"]))
+    
+    def test_underscore_titles(self):
+        self.assertTrue(self.check(["Woodworking", "United_States"]))
+        self.assertTrue(self.check(["Bradawl", "Woodworking", "Hollywood", "Kevin_Bacon"]))
+        self.assertFalse(self.check(["Hollywood", "United_States"]))
+    
+    def test_redirecting_hop(self):
+        # The links of a redirect are those of the page it leads to
+        self.assertTrue(self.check(["Bradawl", "Woodworking"]))
+        self.assertTrue(self.check(["Woodwork", "Hollywood", "Kevin Bacon"]))
+        # Normalized first, then redirected
+        self.assertTrue(self.check(["woodwork", "Hollywood"]))
+        self.assertFalse(self.check(["woodwork", "Awl"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests for OpenAIAgent's batched solving, with a mocked OpenAI client"""
+
+from types import SimpleNamespace
+from unittest import mock
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openai_agent import OpenAIAgent, _path_cache_lock, _path_caches
+from wikibench import TARGET_PAGE_ENV, EvaluationMode
+
+
+def completion(content: str) -> SimpleNamespace:
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def batch_completion(**kwargs) -> SimpleNamespace:
+    """Answer a batched prompt with a path for every start page except 'Unknown'"""
+    prompt = kwargs["messages"][0]["content"]
+    starts = [line[2:] for line in prompt.split("\n") if line.startswith("- ")]
+    paths = [{"start": start, "path": [f"{start} topic", "Kevin Bacon"]}
+             for start in starts if start != "Unknown"]
+    return completion(json.dumps({"paths": paths}))
+
+
+class SolveWikibenchBatchTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.tmpdir.name, "paths")
+        self.starts = [("Bradawl", ""), ("Unknown", ""), ("Tea", ""), ("Bradawl", "")]
+    
+    def tearDown(self):
+        # Agents keep their shelve open for the whole process
+        with _path_cache_lock:
+            cache = _path_caches.pop(self.cache_file, None)
+        if cache is not None:
+            cache.close()
+        self.tmpdir.cleanup()
+    
+    def make_agent(self, cache_file=None) -> OpenAIAgent:
+        with mock.patch.dict(os.environ, {TARGET_PAGE_ENV: "Kevin Bacon"}):
+            agent = OpenAIAgent(api_key="test-key", cache_file=cache_file)
+        agent.client = mock.Mock()
+        agent.client.chat.completions.create.side_effect = batch_completion
+        return agent
+    
+    def test_paths_follow_start_order(self):
+        agent = self.make_agent()
+        paths = agent.solve_wikibench_batch(self.starts, EvaluationMode.NO_TOOL_USE, batch_size=2)
+        self.assertEqual(paths, [
+            ["Bradawl topic", "Kevin Bacon"],
+            [],
+            ["Tea topic", "Kevin Bacon"],
+            ["Bradawl topic", "Kevin Bacon"],
+        ])
+        # Repeated start pages are asked about once
+        self.assertEqual(agent.client.chat.completions.create.call_count, 2)
+        kwargs = agent.client.chat.completions.create.call_args.kwargs
+        self.assertEqual(kwargs["response_format"], {"type": "json_object"})
+    
+    def test_unparseable_response_gives_empty_paths(self):
+        agent = self.make_agent()
+        agent.client.chat.completions.create.side_effect = None
+        agent.client.chat.completions.create.return_value = completion("not json")
+        paths = agent.solve_wikibench_batch(self.starts[:2], EvaluationMode.NO_TOOL_USE)
+        self.assertEqual(paths, [[], []])
+    
+    def test_paths_are_cached(self):
+        first = self.make_agent(self.cache_file)
+        expected = first.solve_wikibench_batch(self.starts, EvaluationMode.NO_TOOL_USE)
+        
+        second = self.make_agent(self.cache_file)
+        paths = second.solve_wikibench_batch(self.starts, EvaluationMode.NO_TOOL_USE)
+        self.assertEqual(paths, expected)
+        # Only the start the model never answered is asked about again
+        second.client.chat.completions.create.assert_called_once()
+        
+        # solve_wikibench shares the cache
+        second.client.chat.completions.create.reset_mock()
+        path = second.solve_wikibench("Tea", "", EvaluationMode.NO_TOOL_USE)
+        self.assertEqual(path, ["Tea topic", "Kevin Bacon"])
+        second.client.chat.completions.create.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
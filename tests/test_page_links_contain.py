@@ -0,0 +1,60 @@
+"""Tests for the streaming link check used when validating hop by hop"""
+
+from unittest import mock
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wikibench import WikipediaNavigator
+
+
+PAGE = (
+    b'<html><body><div id="mw-content-text"><p>Films shot in '
+    b'<a href="/wiki/Hollywood">Hollywood</a> starred '
+    b'<a href="/wiki/Kevin_Bacon">Kevin Bacon</a>.</p></div>'
+    b'<div id="footer"><a href="/wiki/Los_Angeles">Los Angeles</a></div></body></html>'
+)
+
+
+class FakeStream:
+    def __init__(self, body: bytes, chunk_size: int):
+        self._chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def raise_for_status(self):
+        pass
+    
+    def iter_bytes(self):
+        return iter(self._chunks)
+
+
+class PageLinksContainTest(unittest.TestCase):
+    
+    def check(self, title: str, chunk_size: int) -> bool:
+        navigator = WikipediaNavigator(cache_file=None)
+        url = f"https://en.wikipedia.org/wiki/Test_page_{chunk_size}"
+        with mock.patch.object(navigator.session, "stream", return_value=FakeStream(PAGE, chunk_size)):
+            return navigator.page_links_contain(url, title)
+    
+    def test_finds_link_in_any_chunk_size(self):
+        for chunk_size in (1, 2, 3, 4, 7, 64, len(PAGE)):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertTrue(self.check("Kevin Bacon", chunk_size))
+                self.assertTrue(self.check("hollywood", chunk_size))
+    
+    def test_ignores_links_outside_content(self):
+        for chunk_size in (1, 3, len(PAGE)):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertFalse(self.check("Los Angeles", chunk_size))
+                self.assertFalse(self.check("Woodworking", chunk_size))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""Tests for the rate limiter shared by every WikipediaNavigator"""
+
+from unittest import mock
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wikibench import TokenBucket, WikipediaNavigator
+
+
+class FakeClock:
+    """Stands in for time.monotonic and time.sleep; sleeping advances the clock"""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+    
+    def monotonic(self) -> float:
+        return self.now
+    
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TokenBucketTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.multiple("wikibench.time", monotonic=self.clock.monotonic, sleep=self.clock.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_burst_then_paced(self):
+        bucket = TokenBucket(rate=2)
+        bucket.acquire()
+        bucket.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+        
+        # The burst is spent, so each further call waits for half a second's refill
+        for _ in range(4):
+            bucket.acquire()
+        self.assertAlmostEqual(self.clock.now - 1000.0, 2.0)
+        self.assertTrue(all(seconds == 0.5 for seconds in self.clock.sleeps))
+    
+    def test_refills_while_idle(self):
+        bucket = TokenBucket(rate=10, capacity=1)
+        bucket.acquire()
+        self.clock.now += 0.1
+        bucket.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+    
+    def test_non_positive_rate_is_unlimited(self):
+        for rate in (0, -1):
+            bucket = TokenBucket(rate=rate)
+            for _ in range(100):
+                bucket.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+    
+    def test_navigator_follows_requests_per_second(self):
+        with mock.patch.object(WikipediaNavigator, "REQUESTS_PER_SECOND", 0):
+            limiter = WikipediaNavigator._get_rate_limiter()
+            self.assertEqual(limiter.rate, 0)
+            limiter.acquire()
+        self.assertEqual(WikipediaNavigator._get_rate_limiter().rate, WikipediaNavigator.REQUESTS_PER_SECOND)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,13 +3,27 @@
 Standalone script to validate a WikiBench path manually
 """
 
-from wikibench import WikipediaNavigator
+from wikibench import WikipediaNavigator, title_to_url
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 import sys
 
 
-def validate_wikibench_path(start_page: str, path: list) -> dict:
+# Reused across calls so repeated validations share one HTTP session
+_navigator = None
+
+
+def _get_navigator() -> WikipediaNavigator:
+    global _navigator
+    if _navigator is None:
+        _navigator = WikipediaNavigator()
+    return _navigator
+
+
+def validate_wikibench_path(start_page: str, path: list,
+                            navigator: Optional[WikipediaNavigator] = None) -> dict:
     """Validate a WikiBench path and return detailed results"""
-    navigator = WikipediaNavigator()
+    navigator = navigator or _get_navigator()
     
     # Construct full path including start page
     full_path = [start_page] + path
@@ -23,57 +37,62 @@ def validate_wikibench_path(start_page: str, path: list) -> dict:
         "step_details": []
     }
     
-    for i in range(len(full_path) - 1):
-        current_page = full_path[i]
-        next_page = full_path[i + 1]
+    # Look up every page's links concurrently; steps are still checked and reported in order
+    pages = list(dict.fromkeys(full_path[:-1]))
+    max_workers = max(1, min(navigator.MAX_CONCURRENT_FETCHES, len(pages)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        lookups = {page: executor.submit(navigator.get_page_link_titles, page) for page in pages}
+        # Casefolded link titles per page, built once even if the path revisits it
+        link_sets = {}
         
-        print(f"\nStep {i + 1}: {current_page} → {next_page}")
-        
-        try:
-            # Get current page URL
-            current_url = f"https://en.wikipedia.org/wiki/{current_page.replace(' ', '_')}"
-            print(f"  Checking links on: {current_url}")
+        for i in range(len(full_path) - 1):
+            current_page = full_path[i]
+            next_page = full_path[i + 1]
             
-            # Get all links from current page
-            links = navigator.get_page_links(current_url)
-            link_titles = [title for title, _ in links]
+            print(f"\nStep {i + 1}: {current_page} → {next_page}")
             
-            # Check if next page is in the links
-            found = False
-            for title in link_titles:
-                if title.lower() == next_page.lower():
-                    found = True
-                    break
+            try:
+                # Links come from the MediaWiki API rather than the rendered page
+                current_url = title_to_url(current_page)
+                print(f"  Checking links of {current_url} with the MediaWiki API")
+                
+                # Get all links from current page
+                link_titles = lookups[current_page].result()
+                if current_page not in link_sets:
+                    link_sets[current_page] = {title.casefold() for title in link_titles}
+                
+                # Check if next page is in the links (case-insensitively)
+                found = next_page.casefold() in link_sets[current_page]
+                
+                if found:
+                    print(f"  ✓ Found '{next_page}' in links")
+                    validation_results["step_details"].append({
+                        "from": current_page,
+                        "to": next_page,
+                        "valid": True
+                    })
+                else:
+                    print(f"  ✗ '{next_page}' NOT found in links")
+                    print(f"    Available links (first 10, alphabetical): {link_titles[:10]}")
+                    validation_results["valid"] = False
+                    validation_results["errors"].append(f"Step {i + 1}: Cannot navigate from '{current_page}' to '{next_page}'")
+                    validation_results["step_details"].append({
+                        "from": current_page,
+                        "to": next_page,
+                        "valid": False,
+                        "available_links": link_titles[:20]  # Store some available links (alphabetical)
+                    })
             
-            if found:
-                print(f"  ✓ Found '{next_page}' in links")
-                validation_results["step_details"].append({
-                    "from": current_page,
-                    "to": next_page,
-                    "valid": True
-                })
-            else:
-                print(f"  ✗ '{next_page}' NOT found in links")
-                print(f"    Available links (first 10): {link_titles[:10]}")
+            except Exception as e:
+                print(f"  ✗ Error checking page: {e}")
                 validation_results["valid"] = False
-                validation_results["errors"].append(f"Step {i + 1}: Cannot navigate from '{current_page}' to '{next_page}'")
+                validation_results["errors"].append(f"Step {i + 1}: Error accessing page '{current_page}': {e}")
                 validation_results["step_details"].append({
                     "from": current_page,
                     "to": next_page,
                     "valid": False,
-                    "available_links": link_titles[:20]  # Store some available links
+                    "error": str(e)
                 })
-                
-        except Exception as e:
-            print(f"  ✗ Error checking page: {e}")
-            validation_results["valid"] = False
-            validation_results["errors"].append(f"Step {i + 1}: Error accessing page '{current_page}': {e}")
-            validation_results["step_details"].append({
-                "from": current_page,
-                "to": next_page,
-                "valid": False,
-                "error": str(e)
-            })
     
     return validation_results
 
@@ -114,7 +133,7 @@ def main():
         for i, step in enumerate(results["step_details"]):
             if not step["valid"] and "available_links" in step:
                 print(f"\nStep {i + 1} ({step['from']} → {step['to']}):")
-                print("  Consider these available alternatives:")
+                print("  Consider these available alternatives (alphabetical):")
                 for link in step["available_links"][:5]:
                     print(f"    - {link}")
 
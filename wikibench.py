@@ -4,16 +4,187 @@ WikiBench: A benchmark for testing AI agents' ability to navigate from random Wi
 Based on the article: https://1thousandfaces.substack.com/p/wikibench-76-of-sota-models-fail
 """
 
-import requests
+import httpx
 import re
-from typing import List, Dict, Optional, Tuple, Union
+from typing import List, Dict, FrozenSet, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 import time
-from urllib.parse import urljoin, urlparse
+from urllib.parse import quote, unquote, urlparse
 from bs4 import BeautifulSoup
+import soupsieve
+import functools
 import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import orjson  # Optional: much faster results serialization
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # noqa: F401  Lets the shared client speak HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    # Lexbor (C) HTML engine; the fastest way to pull links out of a page
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    # C-backed parsing; links are pulled out with one XPath instead of a BeautifulSoup tree
+    from lxml import etree, html as lxml_html
+except ImportError:
+    lxml_html = None
+
+
+WIKIPEDIA_BASE_URL = "https://en.wikipedia.org"
+WIKI_PREFIX = "/wiki/"
+# An article link: /wiki/<slug> with no namespace (':') or fragment ('#')
+ARTICLE_HREF_RE = re.compile(r'/wiki/([^:#]+)')
+WIKIPEDIA_API_URL = f"{WIKIPEDIA_BASE_URL}/w/api.php"
+DEFAULT_TARGET_PAGE = "Kevin Bacon"
+TARGET_PAGE_ENV = "WIKIBENCH_TARGET_PAGE"
+LINK_CACHE_ENV = "WIKIBENCH_LINK_CACHE"
+PARSE_PROCESSES_ENV = "WIKIBENCH_PARSE_PROCESSES"
+
+
+def get_target_page() -> str:
+    """Return the target page title agents should navigate to (read from WIKIBENCH_TARGET_PAGE)"""
+    return os.getenv(TARGET_PAGE_ENV, DEFAULT_TARGET_PAGE)
+
+
+# One keep-alive pool shared by every navigator; over HTTP/2 concurrent lookups
+# are multiplexed on a single connection instead of each opening its own
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def _get_http_client() -> httpx.Client:
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                http2=HTTP2_AVAILABLE,
+                headers={
+                    'User-Agent': 'WikiBench/1.0 (Educational Research Tool)',
+                    'Accept-Encoding': 'gzip',
+                },
+                follow_redirects=True,  # Special:Random and redirect titles
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=20),
+            )
+        return _http_client
+
+
+if lxml_html is not None:
+    # Plain strings, so cached link titles don't keep the parsed page alive
+    _CONTENT_HREFS = etree.XPath('(//div[@id="mw-content-text"])[1]//a/@href', smart_strings=False)
+
+
+# Characters MediaWiki leaves unescaped in /wiki/ URLs, so built URLs match page hrefs
+_SLUG_SAFE_CHARS = ";@$!*(),/:"
+
+
+@functools.lru_cache(maxsize=65536)
+def title_to_slug(title: str) -> str:
+    """Turn a page title into the URL path segment Wikipedia uses for it"""
+    return quote(title.replace(' ', '_'), safe=_SLUG_SAFE_CHARS)
+
+
+@functools.lru_cache(maxsize=65536)
+def slug_to_title(slug: str) -> str:
+    """Turn a (possibly percent-encoded) /wiki/ URL path segment back into a page title"""
+    return unquote(slug).replace('_', ' ')
+
+
+def title_to_url(title: str) -> str:
+    """Return the Wikipedia URL of a page title"""
+    return WIKIPEDIA_BASE_URL + WIKI_PREFIX + title_to_slug(title)
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_title(title: str) -> str:
+    """Spell a page title the way MediaWiki does (spaces, capitalized first letter)"""
+    title = title.replace('_', ' ').strip()
+    return title[:1].upper() + title[1:]
+
+
+# BeautifulSoup fallback: compiled once rather than re-planned by find/find_all per page
+_CONTENT_SELECTOR = soupsieve.compile('div#mw-content-text')
+_ARTICLE_LINK_SELECTOR = soupsieve.compile('a[href^="/wiki/"]')
+
+
+def _extract_content_hrefs(page: bytes) -> List[str]:
+    """Return the href of every link in a page's main content
+    
+    Uses selectolax, then lxml, then BeautifulSoup, whichever is installed. The
+    selectolax and BeautifulSoup paths already narrow the result to /wiki/ links.
+    """
+    if not page.strip():
+        return []
+    
+    if LexborHTMLParser is not None:
+        content = LexborHTMLParser(page).css_first('div#mw-content-text')
+        if content is None:
+            return []
+        return [node.attributes['href'] for node in content.css('a[href^="/wiki/"]')]
+    
+    if lxml_html is not None:
+        return _CONTENT_HREFS(lxml_html.fromstring(page))
+    
+    # Wikipedia always serves UTF-8, so skip BeautifulSoup's encoding detection
+    soup = BeautifulSoup(page, 'html.parser', from_encoding='utf-8')
+    content = _CONTENT_SELECTOR.select_one(soup)
+    if content is None:
+        return []
+    return [link['href'] for link in _ARTICLE_LINK_SELECTOR.iselect(content)]
+
+
+def _parse_page_link_lists(page: bytes) -> Tuple[List[str], List[str]]:
+    """Return the article links in a page's main content as parallel title and URL lists"""
+    titles: List[str] = []
+    urls: List[str] = []
+    # Hrefs are site-relative, so plain string ops replace urljoin and split;
+    # one regex both filters article links and captures the slug
+    base_url = WIKIPEDIA_BASE_URL
+    match_article = ARTICLE_HREF_RE.fullmatch
+    for href in _extract_content_hrefs(page):
+        match = match_article(href)
+        if match is None:
+            continue
+        urls.append(base_url + href)
+        # Decoded, so titles match the ones the MediaWiki API returns
+        titles.append(slug_to_title(match.group(1)))
+    return titles, urls
+
+
+# Optional worker processes for parsing, so concurrent trials are not serialized
+# on the GIL; sized by WIKIBENCH_PARSE_PROCESSES (unset or 0 parses in-thread)
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def _get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            workers = int(os.getenv(PARSE_PROCESSES_ENV) or 0)
+            if workers <= 0:
+                return None
+            # spawn, since forking a process with live HTTP connections and threads is unsafe
+            _parse_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _parse_pool
 
 
 class EvaluationMode(Enum):
@@ -21,12 +192,16 @@ class EvaluationMode(Enum):
     TOOL_USE = "tool_use"        # Actually navigate Wikipedia
 
 
-@dataclass
+# Results hold no per-instance __dict__ where dataclasses support slots (Python 3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class WikiBenchResult:
     """Result of a single WikiBench evaluation"""
     start_page: str
     start_url: str
-    target_page: str = "Kevin Bacon"
+    target_page: str = DEFAULT_TARGET_PAGE
     target_url: str = "https://en.wikipedia.org/wiki/Kevin_Bacon"
     path: List[str] = None
     score: int = 0
@@ -44,52 +219,433 @@ class WikiBenchResult:
             self.path = []
 
 
+class TokenBucket:
+    """Thread-safe token-bucket rate limiter
+    
+    Allows bursts of up to `capacity` calls while holding the average to `rate`
+    calls per second. A rate of zero or less means no limit.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a call is allowed"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class LinkTitleCache:
+    """On-disk (sqlite) cache of the link titles on each page, with a time-to-live"""
+    
+    def __init__(self, filename: str, ttl: float):
+        self.ttl = ttl
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS page_links "
+                "(title TEXT PRIMARY KEY, links TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+    
+    def get(self, title: str) -> Optional[List[str]]:
+        """Return the cached link titles of a page, or None if missing or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT links FROM page_links WHERE title = ? AND fetched_at >= ?",
+                (_normalize_title(title), time.time() - self.ttl),
+            ).fetchone()
+        if row is None:
+            return None
+        # Titles never contain newlines, so they are stored newline-separated
+        return row[0].split('\n') if row[0] else []
+    
+    def set(self, title: str, link_titles: List[str]):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO page_links (title, links, fetched_at) VALUES (?, ?, ?)",
+                (_normalize_title(title), '\n'.join(link_titles), time.time()),
+            )
+    
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM page_links")
+
+
+# One LinkTitleCache per file, shared by every navigator that uses it
+_link_title_caches: Dict[str, LinkTitleCache] = {}
+_link_title_caches_lock = threading.Lock()
+
+
+def _get_link_title_cache(filename: str, ttl: float) -> LinkTitleCache:
+    with _link_title_caches_lock:
+        cache = _link_title_caches.get(filename)
+        if cache is None:
+            cache = _link_title_caches[filename] = LinkTitleCache(filename, ttl)
+        return cache
+
+
 class WikipediaNavigator:
     """Utility class for Wikipedia navigation and validation"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'WikiBench/1.0 (Educational Research Tool)'
-        })
+    # Page links are cached per process and shared by all navigators, so pages
+    # agents revisit (within a walk or across trials) are not refetched
+    LINK_CACHE_SIZE = 512
+    # Most titles (and pltitles) one MediaWiki API query may name
+    API_TITLES_LIMIT = 50
+    # Most page lookups one validation runs at once
+    MAX_CONCURRENT_FETCHES = 8
+    # How long link titles stay valid in the optional on-disk cache
+    LINK_TITLE_CACHE_TTL = 7 * 24 * 3600
+    # Cap on requests to Wikipedia per second, shared by every navigator and thread;
+    # zero or less turns the limit off
+    REQUESTS_PER_SECOND = 100
+    _rate_limiter: Optional[TokenBucket] = None
+    _rate_limiter_lock = threading.Lock()
+    # Most API requests (of up to 500 titles each) load_backlinks makes for one page
+    MAX_BACKLINK_REQUESTS = 10
+    # Titles of the articles linking to a page, by normalized title; see load_backlinks
+    _backlinks: Dict[str, FrozenSet[str]] = {}
+    _backlinks_lock = threading.Lock()
+    _link_cache: "OrderedDict[str, Tuple[List[str], List[str]]]" = OrderedDict()
+    _link_cache_lock = threading.Lock()
+    
+    def __init__(self, cache_file: Optional[str] = None):
+        self.session = _get_http_client()
+        # Link titles used for validation can persist across runs (see LINK_CACHE_ENV)
+        cache_file = cache_file or os.getenv(LINK_CACHE_ENV)
+        self.link_title_cache = _get_link_title_cache(cache_file, self.LINK_TITLE_CACHE_TTL) if cache_file else None
+        # Link titles this navigator has looked up, by normalized page title, plus
+        # their normalized sets for membership checks; see clear_cache
+        self._links_cache: Dict[str, Tuple[str, ...]] = {}
+        self._link_sets: Dict[str, FrozenSet[str]] = {}
+    
+    @staticmethod
+    def _get_rate_limiter() -> TokenBucket:
+        """The shared rate limiter, rebuilt if REQUESTS_PER_SECOND has changed"""
+        with WikipediaNavigator._rate_limiter_lock:
+            limiter = WikipediaNavigator._rate_limiter
+            if limiter is None or limiter.rate != WikipediaNavigator.REQUESTS_PER_SECOND:
+                limiter = WikipediaNavigator._rate_limiter = TokenBucket(WikipediaNavigator.REQUESTS_PER_SECOND)
+            return limiter
+    
+    def _get(self, url: str, **kwargs) -> httpx.Response:
+        """GET from Wikipedia, waiting for the shared rate limiter first"""
+        self._get_rate_limiter().acquire()
+        return self.session.get(url, **kwargs)
     
     def get_random_page(self) -> Tuple[str, str]:
         """Get a random Wikipedia page title and URL"""
         try:
-            response = self.session.get("https://en.wikipedia.org/wiki/Special:Random")
+            response = self._get(title_to_url("Special:Random"))
             response.raise_for_status()
             
             # Get the final URL after redirect
-            final_url = response.url
-            title = final_url.split('/wiki/')[-1].replace('_', ' ')
+            final_url = str(response.url)
+            title = slug_to_title(final_url.split(WIKI_PREFIX)[-1])
             
             return title, final_url
         except Exception as e:
             raise Exception(f"Failed to get random page: {e}")
     
+    def get_page_link_lists(self, url: str) -> Tuple[List[str], List[str]]:
+        """Extract all Wikipedia links from a page as parallel title and URL lists"""
+        cache = WikipediaNavigator._link_cache
+        with WikipediaNavigator._link_cache_lock:
+            cached = cache.get(url)
+            if cached is not None:
+                cache.move_to_end(url)
+        
+        if cached is None:
+            cached = self._fetch_page_link_lists(url)
+            with WikipediaNavigator._link_cache_lock:
+                cache[url] = cached
+                while len(cache) > self.LINK_CACHE_SIZE:
+                    cache.popitem(last=False)
+        
+        # Copies, so callers cannot modify the cached lists
+        titles, urls = cached
+        return list(titles), list(urls)
+    
+    def page_links_contain(self, url: str, title: str) -> bool:
+        """Check whether a page's main content links to `title`
+        
+        Streams the page through an incremental parser and stops downloading as
+        soon as the link turns up. Parsing only starts once the raw bytes could
+        hold such a link, so pages that plainly don't are never parsed at all.
+        """
+        target = _normalize_title(title)
+        with WikipediaNavigator._link_cache_lock:
+            cached = WikipediaNavigator._link_cache.get(url)
+        if cached is not None or lxml_html is None:
+            link_titles, _ = cached if cached is not None else self.get_page_link_lists(url)
+            return any(_normalize_title(link_title) == target for link_title in link_titles)
+        
+        # Any href to the target holds its longest ASCII word verbatim (percent-encoding
+        # leaves letters and digits alone), so parsing can wait until those bytes appear
+        words = re.findall(r'[A-Za-z0-9]+', target)
+        needle = max(words, key=len).lower().encode() if words else b""
+        skipped: List[bytes] = []
+        tail = b""
+        
+        match_article = ARTICLE_HREF_RE.fullmatch
+        parser = etree.HTMLPullParser(events=("start",), tag="a", encoding="utf-8")
+        self._get_rate_limiter().acquire()
+        with self.session.stream("GET", url) as response:
+            response.raise_for_status()
+            for chunk in response.iter_bytes():
+                if needle:
+                    window = tail + chunk.lower()
+                    skipped.append(chunk)
+                    if needle not in window:
+                        # Keep enough to catch the word straddling two chunks
+                        tail = window[max(0, len(window) - len(needle) + 1):]
+                        continue
+                    needle = b""
+                    chunk = b"".join(skipped)
+                parser.feed(chunk)
+                for _, link in parser.read_events():
+                    match = match_article(link.get("href") or "")
+                    if match is None:
+                        continue
+                    if (_normalize_title(slug_to_title(match.group(1))) == target
+                            and any(div.get("id") == "mw-content-text" for div in link.iterancestors("div"))):
+                        return True
+        return False
+    
+    @classmethod
+    def clear_link_cache(cls):
+        """Forget all cached page links"""
+        with cls._link_cache_lock:
+            cls._link_cache.clear()
+    
+    def _fetch_page_link_lists(self, url: str) -> Tuple[List[str], List[str]]:
+        try:
+            response = self._get(url)
+            response.raise_for_status()
+            
+            pool = _get_parse_pool()
+            if pool is not None:
+                return pool.submit(_parse_page_link_lists, response.content).result()
+            return _parse_page_link_lists(response.content)
+        except Exception as e:
+            raise Exception(f"Failed to get page links: {e}")
+    
     def get_page_links(self, url: str) -> List[Tuple[str, str]]:
         """Extract all Wikipedia links from a page"""
+        titles, urls = self.get_page_link_lists(url)
+        return list(zip(titles, urls))
+    
+    def get_page_link_titles(self, title: str) -> List[str]:
+        """Return the titles of the articles a page links to
+        
+        Asks the MediaWiki API, which sends only the link titles instead of the
+        whole rendered page. The titles come back sorted rather than in page
+        order, so this is meant for membership checks; agents choosing links use
+        get_page_link_lists. Falls back to scraping the page if the API fails.
+        Results are remembered by this navigator until clear_cache is called.
+        """
+        key = _normalize_title(title)
+        cached = self._links_cache.get(key)
+        if cached is None and self.link_title_cache is not None:
+            cached = self.link_title_cache.get(title)
+            if cached is not None:
+                self._links_cache[key] = cached = tuple(cached)
+        if cached is not None:
+            return list(cached)
+        
         try:
-            response = self.session.get(url)
+            link_titles = self._fetch_api_link_titles(title)
+        except Exception:
+            link_titles, _ = self.get_page_link_lists(title_to_url(title))
+        
+        if self.link_title_cache is not None:
+            self.link_title_cache.set(title, link_titles)
+        self._links_cache[key] = tuple(link_titles)
+        return link_titles
+    
+    def clear_cache(self):
+        """Forget the link titles this navigator has looked up
+        
+        The shared page-link cache is separate; see clear_link_cache.
+        """
+        self._links_cache.clear()
+        self._link_sets.clear()
+    
+    def _known_link_set(self, title: str) -> Optional[FrozenSet[str]]:
+        """Normalized link titles of a page already looked up (here or on disk), else None"""
+        key = _normalize_title(title)
+        link_set = self._link_sets.get(key)
+        if link_set is None:
+            link_titles = self._links_cache.get(key)
+            if link_titles is None and self.link_title_cache is not None:
+                link_titles = self.link_title_cache.get(title)
+                if link_titles is not None:
+                    self._links_cache[key] = link_titles = tuple(link_titles)
+            if link_titles is None:
+                return None
+            link_set = self._link_sets[key] = frozenset(map(_normalize_title, link_titles))
+        return link_set
+    
+    def _fetch_api_link_titles(self, title: str) -> List[str]:
+        link_titles: List[str] = []
+        for query in self._query_api_links({"titles": title}):
+            for page in query.get("pages", []):
+                if page.get("missing") or page.get("invalid"):
+                    raise Exception(f"No such page: {title}")
+                link_titles.extend(link["title"] for link in page.get("links", ()))
+        return link_titles
+    
+    def check_links_exist(self, pairs: List[Tuple[str, str]]) -> List[bool]:
+        """Check whether each (page, linked page) title pair is a link on Wikipedia
+        
+        Names up to API_TITLES_LIMIT pairs per MediaWiki API query, so a whole path
+        is usually checked with one request instead of one page fetch per hop.
+        Pages whose links are already known (see get_page_link_titles and the
+        on-disk link cache), and links into pages whose backlinks are loaded,
+        are answered without a request.
+        """
+        found: List[Optional[bool]] = [None] * len(pairs)
+        for i, (page, linked) in enumerate(pairs):
+            if self.is_known_backlink(page, linked):
+                found[i] = True
+                continue
+            link_set = self._known_link_set(page)
+            if link_set is not None:
+                found[i] = _normalize_title(linked) in link_set
+        
+        pending = [i for i, exists in enumerate(found) if exists is None]
+        for start in range(0, len(pending), self.API_TITLES_LIMIT):
+            batch = pending[start:start + self.API_TITLES_LIMIT]
+            for i, exists in zip(batch, self._query_links_exist([pairs[i] for i in batch])):
+                found[i] = exists
+        return found
+    
+    def _query_links_exist(self, pairs: List[Tuple[str, str]]) -> List[bool]:
+        pages = list(dict.fromkeys(page for page, _ in pairs))
+        params = {"titles": "|".join(pages)}
+        # With an on-disk cache, fetch whole link lists so later runs can reuse them
+        store = self.link_title_cache is not None
+        if not store:
+            # Only report links to these pages
+            params["pltitles"] = "|".join(dict.fromkeys(linked for _, linked in pairs))
+        renamed: Dict[str, str] = {}
+        links: Dict[str, set] = {}
+        missing = set()
+        for query in self._query_api_links(params):
+            for entry in query.get("normalized", []) + query.get("redirects", []):
+                renamed[entry["from"]] = entry["to"]
+            for page in query.get("pages", []):
+                if page.get("missing") or page.get("invalid"):
+                    missing.add(page.get("title"))
+                links.setdefault(page.get("title"), set()).update(link["title"] for link in page.get("links", ()))
+        
+        def resolve(page: str) -> str:
+            # Requested titles may be normalized and then redirected
+            page = renamed.get(page, page)
+            return renamed.get(page, page)
+        
+        if store:
+            for page in pages:
+                resolved = resolve(page)
+                if resolved in links and resolved not in missing:
+                    link_titles = sorted(links[resolved])
+                    self.link_title_cache.set(page, link_titles)
+                    self._links_cache[_normalize_title(page)] = tuple(link_titles)
+        
+        return [_normalize_title(linked) in links.get(resolve(page), ()) for page, linked in pairs]
+    
+    def load_backlinks(self, title: str) -> FrozenSet[str]:
+        """Return the titles of the articles that link to `title`, fetched once per process
+        
+        Once loaded, validation confirms a hop into `title` from this set instead
+        of looking at the linking page. Meant for the target page. Redirects to
+        `title` are left out, as a hop from one is not a link. If the lookup fails
+        or would take more than MAX_BACKLINK_REQUESTS requests, an empty set is
+        remembered instead, so each process tries only once.
+        """
+        key = _normalize_title(title)
+        backlinks = WikipediaNavigator._backlinks.get(key)
+        if backlinks is None:
+            linking: List[str] = []
+            params = {
+                "list": "backlinks",
+                "bltitle": title,
+                "blnamespace": 0,
+                "blfilterredir": "nonredirects",
+                "bllimit": "max",
+            }
+            try:
+                for query in self._query_api(params, max_requests=self.MAX_BACKLINK_REQUESTS):
+                    linking.extend(page["title"] for page in query.get("backlinks", ()))
+                backlinks = frozenset(linking)
+            except Exception:
+                backlinks = frozenset()  # Hops into `title` are then looked up like any other
+            with WikipediaNavigator._backlinks_lock:
+                WikipediaNavigator._backlinks[key] = backlinks
+        return backlinks
+    
+    def is_known_backlink(self, page: str, linked: str) -> bool:
+        """True if `page` is among the loaded backlinks of `linked`, without a request
+        
+        Only a positive answer is conclusive: `page` may be a redirect to a
+        page that does link there, or the backlinks of `linked` may not be loaded.
+        """
+        backlinks = WikipediaNavigator._backlinks.get(_normalize_title(linked))
+        return backlinks is not None and _normalize_title(page) in backlinks
+    
+    def _query_api_links(self, params: Dict):
+        """Yield the 'query' part of each response to a prop=links API request"""
+        return self._query_api({
+            "prop": "links",
+            "plnamespace": 0,
+            "pllimit": "max",
+            "redirects": 1,  # Same page the /wiki/ URL would have redirected to
+            **params,
+        })
+    
+    def _query_api(self, params: Dict, max_requests: Optional[int] = None):
+        """Yield the 'query' part of each response to an action=query API request
+        
+        Raises instead of making more than `max_requests` requests, if given.
+        """
+        params = {
+            "action": "query",
+            "format": "json",
+            "formatversion": "2",
+            **params,
+        }
+        requests_made = 0
+        while True:
+            if max_requests is not None and requests_made >= max_requests:
+                raise Exception(f"Query needs more than {max_requests} requests")
+            requests_made += 1
+            response = self._get(WIKIPEDIA_API_URL, params=params)
             response.raise_for_status()
+            data = response.json()
+            if "error" in data:
+                raise Exception(data["error"].get("info", data["error"]))
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            content = soup.find('div', {'id': 'mw-content-text'})
-            
-            if not content:
-                return []
-            
-            links = []
-            for link in content.find_all('a', href=True):
-                href = link['href']
-                if href.startswith('/wiki/') and ':' not in href and '#' not in href:
-                    full_url = urljoin("https://en.wikipedia.org", href)
-                    title = href.split('/wiki/')[-1].replace('_', ' ')
-                    links.append((title, full_url))
+            yield data.get("query", {})
             
-            return links
-        except Exception as e:
-            raise Exception(f"Failed to get page links: {e}")
+            # Long results are returned in several parts
+            if "continue" not in data:
+                return
+            params.update(data["continue"])
     
     def is_valid_wikipedia_path(self, path: List[str]) -> bool:
         """Validate that a path represents valid Wikipedia page transitions"""
@@ -97,21 +653,29 @@ class WikipediaNavigator:
             return False
         
         try:
-            for i in range(len(path) - 1):
-                current_url = f"https://en.wikipedia.org/wiki/{path[i].replace(' ', '_')}"
-                next_page = path[i + 1]
-                
-                links = self.get_page_links(current_url)
-                link_titles = [title for title, _ in links]
-                
-                if next_page not in link_titles:
-                    return False
+            hops = list(zip(path, path[1:]))
+            try:
+                return all(self.check_links_exist(hops))
+            except Exception:
+                pass  # Batched query failed; check hop by hop instead
+            
+            def hop_exists(hop: Tuple[str, str]) -> bool:
+                page, next_page = hop
+                if self.is_known_backlink(page, next_page):
+                    return True
+                link_set = self._known_link_set(page)
+                if link_set is not None:
+                    return _normalize_title(next_page) in link_set
+                # Only a yes/no is needed, so stop reading the page at the link
+                return self.page_links_contain(title_to_url(page), next_page)
             
-            return True
+            # The hops are independent, so check them concurrently
+            with ThreadPoolExecutor(max_workers=max(1, min(self.MAX_CONCURRENT_FETCHES, len(hops)))) as executor:
+                return all(executor.map(hop_exists, hops))
         except Exception:
             return False
     
-    def check_if_reached_target(self, current_page: str, target_page: str = "Kevin Bacon") -> bool:
+    def check_if_reached_target(self, current_page: str, target_page: str = DEFAULT_TARGET_PAGE) -> bool:
         """Check if the current page is the target page"""
         return current_page.lower() == target_page.lower()
 
@@ -145,7 +709,11 @@ class WikiBenchScorer:
 
 
 class AIAgent(ABC):
-    """Abstract base class for AI agents to be evaluated"""
+    """Abstract base class for AI agents to be evaluated
+    
+    Implementations should keep per-walk state in locals rather than on the
+    instance so that one agent can solve several challenges concurrently.
+    """
     
     @abstractmethod
     def solve_wikibench(self, start_page: str, start_url: str, mode: EvaluationMode) -> List[str]:
@@ -158,7 +726,9 @@ class AIAgent(ABC):
             mode: Evaluation mode (tool use or no tool use)
             
         Returns:
-            List of page titles representing the path to the target page
+            List of page titles representing the path to the target page.
+            The evaluator copies it into the result, so agents may return a
+            shared or immutable sequence.
         """
         pass
     
@@ -171,12 +741,12 @@ class AIAgent(ABC):
 class WikiBenchEvaluator:
     """Main evaluation harness for WikiBench"""
     
-    def __init__(self, target_page: str = "Kevin Bacon", target_url: Optional[str] = None):
+    def __init__(self, target_page: str = DEFAULT_TARGET_PAGE, target_url: Optional[str] = None):
         self.navigator = WikipediaNavigator()
         self.scorer = WikiBenchScorer()
         self.target_page = target_page
         # Derive target URL if not provided
-        self.target_url = target_url or f"https://en.wikipedia.org/wiki/{target_page.replace(' ', '_')}"
+        self.target_url = target_url or title_to_url(target_page)
     
     def run_single_evaluation(self, agent: AIAgent, mode: EvaluationMode, 
                             start_page: Optional[str] = None, 
@@ -205,7 +775,7 @@ class WikiBenchEvaluator:
                 result.raw_response = raw
             
             result.time_taken = time.time() - start_time
-            result.path = path if path else []
+            result.path = list(path) if path else []
             
             # Check for cheating (direct jump to target without valid path)
             if len(result.path) == 1 and result.path[0] == self.target_page:
@@ -235,19 +805,25 @@ class WikiBenchEvaluator:
         return result
     
     def run_evaluation_suite(self, agent: AIAgent, mode: EvaluationMode, 
-                           num_trials: int = 10) -> List[WikiBenchResult]:
-        """Run multiple WikiBench evaluations"""
-        results = []
-        
-        for i in range(num_trials):
-            print(f"Running trial {i+1}/{num_trials} for {agent.get_name()}")
-            result = self.run_single_evaluation(agent, mode)
-            results.append(result)
-            
-            # Small delay to be respectful to Wikipedia
-            time.sleep(1)
+                           num_trials: int = 10, max_workers: int = 4) -> List[WikiBenchResult]:
+        """Run multiple WikiBench evaluations, up to `max_workers` at a time"""
+        agent_name = agent.get_name()
+        
+        if mode == EvaluationMode.TOOL_USE:
+            # Fetched (or given up on) once per process; every path's final hop is
+            # then checked locally
+            self.navigator.load_backlinks(self.target_page)
+        
+        # Requests to Wikipedia are paced by WikipediaNavigator's shared rate limiter
+        def run_trial(i: int) -> WikiBenchResult:
+            print(f"Running trial {i+1}/{num_trials} for {agent_name}")
+            return self.run_single_evaluation(agent, mode)
         
-        return results
+        # Trials are mostly waiting on HTTP, so run them concurrently; results
+        # keep trial order
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, num_trials))) as executor:
+            futures = [executor.submit(run_trial, i) for i in range(num_trials)]
+            return [future.result() for future in futures]
     
     def generate_report(self, results: List[WikiBenchResult], agent_name: str) -> Dict:
         """Generate evaluation report"""
@@ -255,13 +831,28 @@ class WikiBenchEvaluator:
             return {}
         
         total_trials = len(results)
-        successful_trials = sum(1 for r in results if r.success)
-        gave_up_count = sum(1 for r in results if r.gave_up)
-        cheated_count = sum(1 for r in results if r.cheated)
-        invalid_path_count = sum(1 for r in results if r.invalid_path)
+        successful_trials = gave_up_count = cheated_count = invalid_path_count = 0
+        score_total = 0
+        best_score = worst_score = results[0].score
+        path_length_total = path_count = 0
         
-        scores = [r.score for r in results]
-        path_lengths = [len(r.path) for r in results if r.path]
+        # One pass over the results for every aggregate
+        for r in results:
+            successful_trials += r.success
+            gave_up_count += r.gave_up
+            cheated_count += r.cheated
+            invalid_path_count += r.invalid_path
+            
+            score = r.score
+            score_total += score
+            if score < best_score:
+                best_score = score
+            elif score > worst_score:
+                worst_score = score
+            
+            if r.path:
+                path_length_total += len(r.path)
+                path_count += 1
         
         report = {
             "agent_name": agent_name,
@@ -273,10 +864,10 @@ class WikiBenchEvaluator:
             "gave_up_count": gave_up_count,
             "cheated_count": cheated_count,
             "invalid_path_count": invalid_path_count,
-            "average_score": sum(scores) / len(scores),
-            "best_score": min(scores),
-            "worst_score": max(scores),
-            "average_path_length": sum(path_lengths) / len(path_lengths) if path_lengths else 0,
+            "average_score": score_total / total_trials,
+            "best_score": best_score,
+            "worst_score": worst_score,
+            "average_path_length": path_length_total / path_count if path_count else 0,
             "results": [
                 {
                     "start_page": r.start_page,
@@ -298,6 +889,11 @@ class WikiBenchEvaluator:
     
     def save_results(self, report: Dict, filename: str):
         """Save evaluation results to JSON file"""
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+            return
+        
         with open(filename, 'w') as f:
             json.dump(report, f, indent=2)
 